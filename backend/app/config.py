@@ -19,6 +19,18 @@ class Settings(BaseSettings):
     news_poll_interval: int = Field(default=60, alias="NEWS_POLL_INTERVAL")
     price_poll_interval: int = Field(default=60, alias="PRICE_POLL_INTERVAL")
 
+    # Scoring scheduler (admission control in front of the sentiment model)
+    scheduler_max_batch_size: int = Field(default=32, alias="SCHEDULER_MAX_BATCH_SIZE")
+    scheduler_bulk_threshold: int = Field(default=64, alias="SCHEDULER_BULK_THRESHOLD")
+    scheduler_client_max_concurrency: int = Field(default=4, alias="SCHEDULER_CLIENT_MAX_CONCURRENCY")
+    scheduler_client_max_texts: int = Field(default=5000, alias="SCHEDULER_CLIENT_MAX_TEXTS")
+    scheduler_max_queued_texts: int = Field(default=50000, alias="SCHEDULER_MAX_QUEUED_TEXTS")
+
+    # Deadlines (seconds) per priority class
+    scheduler_live_deadline: float = Field(default=10.0, alias="SCHEDULER_LIVE_DEADLINE")
+    scheduler_interactive_deadline: float = Field(default=30.0, alias="SCHEDULER_INTERACTIVE_DEADLINE")
+    scheduler_bulk_deadline: float = Field(default=900.0, alias="SCHEDULER_BULK_DEADLINE")
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,12 +1,14 @@
 from __future__ import annotations
 import asyncio
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from fastapi.responses import JSONResponse
+from typing import List, Literal, Optional
 
 from .config import settings
 from .models import SentimentResult
 from .services.sentiment_service import SentimentService
+from .services.scheduler_service import ScoringScheduler, Priority, SchedulerRejected
 from .services.news_service import NewsService
 from .services.price_service import PriceService
 from .services.predictor_service import PredictorService
@@ -26,7 +28,19 @@ app.add_middleware(
 
 # Instantiate services
 sentiment = SentimentService(model_name=settings.huggingface_model)
-news = NewsService(api_key=settings.newsapi_key, sentiment=sentiment)
+scheduler = ScoringScheduler(
+    sentiment=sentiment,
+    max_batch_size=settings.scheduler_max_batch_size,
+    client_max_concurrency=settings.scheduler_client_max_concurrency,
+    client_max_texts=settings.scheduler_client_max_texts,
+    max_queued_texts=settings.scheduler_max_queued_texts,
+    deadlines={
+        Priority.LIVE: settings.scheduler_live_deadline,
+        Priority.INTERACTIVE: settings.scheduler_interactive_deadline,
+        Priority.BULK: settings.scheduler_bulk_deadline,
+    },
+)
+news = NewsService(api_key=settings.newsapi_key, sentiment=sentiment, scheduler=scheduler)
 prices = PriceService()
 predictor = PredictorService()
 stream = StreamManager(
@@ -42,18 +56,46 @@ stream = StreamManager(
 
 @app.on_event("startup")
 async def _startup():
+    scheduler.start()
     asyncio.create_task(stream.start_background())
 
 
+@app.exception_handler(SchedulerRejected)
+async def _scheduler_rejected(request: Request, exc: SchedulerRejected):
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers())
+
+
 @app.get("/api/ping")
 def ping():
     return {"status": "ok"}
 
 
 @app.post("/api/sentiment", response_model=List[SentimentResult])
-def classify_texts(texts: List[str]):
-    """Classify a batch of raw text strings into sentiment labels."""
-    return sentiment.score_texts(texts)
+async def classify_texts(
+    texts: List[str],
+    request: Request,
+    priority: Optional[Literal["bulk"]] = None,
+    timeout: Optional[float] = Query(default=None, gt=0, allow_inf_nan=False),
+):
+    """Classify a batch of raw text strings into sentiment labels.
+
+    Requests larger than SCHEDULER_BULK_THRESHOLD are always bulk work; smaller
+    ones may opt down with ``priority=bulk``. ``timeout`` (seconds) can only
+    shorten the class deadline. Quotas are keyed on the remote address.
+    Overloaded or over-quota requests get 429/503 with a Retry-After header.
+    """
+    if priority is None and len(texts) <= settings.scheduler_bulk_threshold:
+        cls = Priority.INTERACTIVE
+    else:
+        cls = Priority.BULK
+    client_id = request.client.host if request.client else "unknown"
+    return await scheduler.submit(texts, priority=cls, client_id=client_id, deadline=timeout)
+
+
+@app.get("/api/scheduler/metrics")
+def scheduler_metrics():
+    """Queue depth, shed counts and latency estimate of the scoring scheduler."""
+    return scheduler.metrics()
 
 
 @app.websocket("/ws/stream")
@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
 import httpx
 import logging
 from ..models import SentimentResult
 from .sentiment_service import SentimentService
+from .scheduler_service import ScoringScheduler, Priority
 from ..config import settings
 
 
@@ -14,10 +15,16 @@ FINNHUB_NEWS_URL = "https://finnhub.io/api/v1/company-news"
 
 
 class NewsService:
-    def __init__(self, api_key: str | None, sentiment: SentimentService):
+    def __init__(
+        self,
+        api_key: str | None,
+        sentiment: SentimentService,
+        scheduler: Optional[ScoringScheduler] = None,
+    ):
         self.api_key = api_key
         self.finnhub_key = settings.finnhub_key
         self.sentiment = sentiment
+        self.scheduler = scheduler
 
     async def fetch_newsapi_texts(self, symbol: str, limit: int = 10) -> List[str]:
         """Fetch news from NewsAPI"""
@@ -94,4 +101,7 @@ class NewsService:
         texts = await self.fetch_news_texts(symbol, limit=limit)
         if not texts:
             return []
+        if self.scheduler is not None:
+            # live stream work runs ahead of API traffic
+            return await self.scheduler.submit(texts, Priority.LIVE, symbol=symbol, source="news")
         return self.sentiment.score_texts(texts, symbol=symbol, source="news")
@@ -0,0 +1,411 @@
+# app/services/scheduler_service.py
+from __future__ import annotations
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional
+import logging
+
+if TYPE_CHECKING:
+    from ..models import SentimentResult
+    from .sentiment_service import SentimentService
+
+log = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Scoring priority classes. Lower value is served first."""
+    LIVE = 0
+    INTERACTIVE = 1
+    BULK = 2
+
+
+class SchedulerRejected(Exception):
+    """Raised when a scoring request is refused or shed by the scheduler."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[float] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+    def headers(self) -> Dict[str, str]:
+        if self.retry_after is None:
+            return {}
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+@dataclass(eq=False)
+class _Job:
+    priority: Priority
+    texts: List[str]
+    deadline: float  # time.monotonic() value
+    future: asyncio.Future
+    client_id: Optional[str] = None
+    symbol: Optional[str] = None
+    source: Optional[str] = None
+    meta: Optional[dict] = None
+    offset: int = 0
+    results: List["SentimentResult"] = field(default_factory=list)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.texts) - self.offset
+
+
+class _CostModel:
+    """Online estimate of one model call as ``overhead + per_text * n`` seconds.
+
+    Fitted by least squares over exponentially weighted moments of chunk size
+    and duration, so fixed per-call cost is not smeared over small chunks.
+    While chunk sizes barely vary the slope is unidentifiable, and the current
+    split is just rescaled to match the observed mean.
+    """
+
+    def __init__(self, per_text: float, overhead: float = 0.0, size: int = 1, alpha: float = 0.2):
+        self.per_text = per_text
+        self.overhead = overhead
+        self.alpha = alpha
+        t = self.predict(size)
+        self._n, self._t = float(size), t
+        self._nn, self._nt = float(size * size), size * t
+
+    def predict(self, n: int) -> float:
+        return self.overhead + self.per_text * n
+
+    def observe(self, n: int, seconds: float):
+        # damp one-off stalls (e.g. model warm-up); sustained slowdowns still converge
+        seconds = min(seconds, 4 * self.predict(n))
+        a = self.alpha
+        self._n += a * (n - self._n)
+        self._t += a * (seconds - self._t)
+        self._nn += a * (n * n - self._nn)
+        self._nt += a * (n * seconds - self._nt)
+
+        var = self._nn - self._n ** 2
+        if var > 1.0:
+            slope = (self._nt - self._n * self._t) / var
+            intercept = self._t - slope * self._n
+            if slope > 0 and intercept >= 0:
+                self.per_text, self.overhead = slope, intercept
+                return
+        scale = self._t / self.predict(self._n)
+        self.per_text *= scale
+        self.overhead *= scale
+
+
+class ScoringScheduler:
+    """Admission control and priority scheduling in front of SentimentService.
+
+    A single worker feeds the model in chunks of at most ``max_batch_size`` texts,
+    always picking the highest priority class that has work. Large jobs are
+    therefore preempted between chunks, and jobs within a class are served
+    round-robin so one big bulk job cannot monopolise its class either.
+
+    Requests are refused up front (429) when a client exceeds its concurrency
+    or in-flight text quota, and shed (503) when the estimated queueing delay
+    would blow through their deadline or the queue is full. Deadlines are
+    enforced on the waiting side, so a job stuck behind higher-priority traffic
+    is shed on time rather than when its class finally gets served.
+    """
+
+    def __init__(
+        self,
+        sentiment: "SentimentService",
+        max_batch_size: int = 32,
+        client_max_concurrency: int = 4,
+        client_max_texts: int = 5000,
+        max_queued_texts: int = 50000,
+        deadlines: Optional[Dict[Priority, float]] = None,
+        initial_text_latency: float = 0.02,
+        initial_call_overhead: float = 0.0,
+    ):
+        self.sentiment = sentiment
+        self.max_batch_size = max_batch_size
+        self.client_max_concurrency = client_max_concurrency
+        self.client_max_texts = client_max_texts
+        self.max_queued_texts = max_queued_texts
+        self.deadlines: Dict[Priority, float] = {
+            Priority.LIVE: 10.0,
+            Priority.INTERACTIVE: 30.0,
+            Priority.BULK: 900.0,
+        }
+        if deadlines:
+            self.deadlines.update(deadlines)
+
+        # pending jobs per priority class, served round-robin within a class
+        self.queues: Dict[Priority, Deque[_Job]] = {p: deque() for p in Priority}
+        # per-client in-flight accounting: jobs and texts
+        self.client_jobs: Dict[str, int] = {}
+        self.client_texts: Dict[str, int] = {}
+
+        # model call cost, used for admission and queueing delay estimates
+        self.cost = _CostModel(initial_text_latency, initial_call_overhead, size=max_batch_size)
+
+        self.completed: Dict[Priority, int] = {p: 0 for p in Priority}
+        self.rejected: Dict[str, int] = {}
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        # consecutive worker crashes, drives the restart backoff
+        self._crashes = 0
+        self._restart: Optional[asyncio.TimerHandle] = None
+
+    def start(self):
+        if self._worker is not None and not self._worker.done():
+            return
+        if self._restart is not None:
+            # crashed recently; the pending restart will bring the worker back
+            return
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+        self._worker.add_done_callback(self._on_worker_done)
+
+    def _on_worker_done(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is None:
+            return
+        self._crashes += 1
+        delay = min(0.05 * 2 ** (self._crashes - 1), 30.0)
+        log.exception(f"Scoring worker crashed, restarting in {delay:.2f}s", exc_info=exc)
+        self._restart = asyncio.get_running_loop().call_later(delay, self._restart_worker)
+
+    def _restart_worker(self):
+        self._restart = None
+        self.start()
+
+    # -------------------------------
+    # Admission
+    # -------------------------------
+    async def submit(
+        self,
+        texts: List[str],
+        priority: Priority = Priority.INTERACTIVE,
+        client_id: Optional[str] = None,
+        deadline: Optional[float] = None,
+        symbol: Optional[str] = None,
+        source: Optional[str] = None,
+        meta: Optional[dict] = None,
+    ) -> List["SentimentResult"]:
+        """Queue texts for scoring and wait for the results.
+
+        ``deadline`` is a relative timeout in seconds; it can only tighten the
+        class deadline. Raises SchedulerRejected if the job is refused or shed.
+        """
+        if deadline is not None and not (math.isfinite(deadline) and deadline > 0):
+            raise ValueError(f"deadline must be a finite positive number of seconds, got {deadline!r}")
+        if not texts:
+            return []
+        self.start()
+
+        budget = self.deadlines[priority]
+        if deadline is not None:
+            budget = min(deadline, budget)
+        self._admit(len(texts), priority, client_id, budget)
+
+        job = _Job(
+            priority=priority,
+            texts=list(texts),
+            deadline=time.monotonic() + budget,
+            future=asyncio.get_running_loop().create_future(),
+            client_id=client_id,
+            symbol=symbol,
+            source=source,
+            meta=meta,
+        )
+        if client_id is not None:
+            self.client_jobs[client_id] = self.client_jobs.get(client_id, 0) + 1
+            self.client_texts[client_id] = self.client_texts.get(client_id, 0) + len(texts)
+        self.queues[priority].append(job)
+        self._wakeup.set()
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(job.future), job.deadline - time.monotonic()
+            )
+        except asyncio.TimeoutError:
+            self.rejected["expired"] = self.rejected.get("expired", 0) + 1
+            raise SchedulerRejected(
+                503, "Deadline expired before scoring finished", self.estimate_wait(priority)
+            ) from None
+        finally:
+            # drop abandoned work; a chunk already running is discarded by the worker
+            if not job.future.done():
+                job.future.cancel()
+            self._dequeue(job)
+            self._release(job)
+
+    def _admit(self, n: int, priority: Priority, client_id: Optional[str], budget: float):
+        if client_id is not None:
+            if n > self.client_max_texts:
+                self._reject(
+                    "too_large",
+                    413,
+                    f"Request has {n} texts, per-client limit is {self.client_max_texts}",
+                )
+            if self.client_jobs.get(client_id, 0) >= self.client_max_concurrency:
+                self._reject(
+                    "client_concurrency",
+                    429,
+                    f"Client has {self.client_max_concurrency} requests in flight",
+                    self.estimate_wait(priority),
+                )
+            if self.client_texts.get(client_id, 0) + n > self.client_max_texts:
+                self._reject(
+                    "client_texts",
+                    429,
+                    f"Client in-flight text quota of {self.client_max_texts} exceeded",
+                    self.estimate_wait(priority),
+                )
+
+        # live work is never refused for queue size, only for missing its deadline
+        if priority != Priority.LIVE and self.queued_texts() + n > self.max_queued_texts:
+            self._reject("queue_full", 503, "Scoring queue is full", self.estimate_wait(priority))
+
+        # a request that cannot finish in time even on an idle model will never succeed
+        work = self.job_cost(n)
+        if work > budget:
+            self._reject(
+                "too_slow",
+                413,
+                f"Scoring {n} texts takes about {work:.1f}s, deadline is {budget:.1f}s",
+            )
+
+        wait = self.estimate_wait(priority)
+        if wait + work > budget:
+            self._reject(
+                "deadline",
+                503,
+                f"Estimated completion in {wait + work:.1f}s exceeds deadline of {budget:.1f}s",
+                wait + work - budget,
+            )
+
+    def _reject(self, reason: str, status_code: int, detail: str, retry_after: Optional[float] = None):
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        raise SchedulerRejected(status_code, detail, retry_after)
+
+    def _release(self, job: _Job):
+        cid = job.client_id
+        if cid is None:
+            return
+        self.client_jobs[cid] -= 1
+        self.client_texts[cid] -= len(job.texts)
+        if self.client_jobs[cid] <= 0:
+            del self.client_jobs[cid]
+            del self.client_texts[cid]
+
+    # -------------------------------
+    # Worker
+    # -------------------------------
+    def _next_job(self) -> Optional[_Job]:
+        for p in Priority:
+            q = self.queues[p]
+            while q:
+                job = q[0]
+                if job.future.done():
+                    # caller went away (cancelled)
+                    q.popleft()
+                    continue
+                if time.monotonic() > job.deadline:
+                    q.popleft()
+                    self.rejected["expired"] = self.rejected.get("expired", 0) + 1
+                    job.future.set_exception(
+                        SchedulerRejected(503, "Deadline expired while queued", self.estimate_wait(p))
+                    )
+                    continue
+                return job
+        return None
+
+    async def _run(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            chunk = job.texts[job.offset:job.offset + self.max_batch_size]
+            started = time.monotonic()
+            try:
+                scored = await asyncio.to_thread(
+                    self.sentiment.score_texts,
+                    chunk,
+                    symbol=job.symbol,
+                    source=job.source,
+                    meta=job.meta,
+                )
+            except Exception as e:
+                log.error(f"Scoring failed for {job.priority.name.lower()} job: {e}")
+                self._dequeue(job)
+                if not job.future.done():
+                    job.future.set_exception(e)
+                continue
+
+            self.cost.observe(len(chunk), time.monotonic() - started)
+            self._crashes = 0
+
+            job.offset += len(chunk)
+            job.results.extend(scored)
+            if not self._dequeue(job) or job.future.done():
+                continue
+            if job.remaining == 0:
+                self.completed[job.priority] += 1
+                job.future.set_result(job.results)
+            else:
+                # rotate so other jobs of the same class get a turn
+                self.queues[job.priority].append(job)
+
+    def _dequeue(self, job: _Job) -> bool:
+        try:
+            self.queues[job.priority].remove(job)
+        except ValueError:
+            return False
+        return True
+
+    # -------------------------------
+    # Metrics
+    # -------------------------------
+    def queued_texts(self, max_priority: Priority = Priority.BULK) -> int:
+        return sum(
+            job.remaining
+            for p in Priority
+            if p <= max_priority
+            for job in self.queues[p]
+        )
+
+    def job_cost(self, n: int) -> float:
+        """Estimated model seconds to score ``n`` texts, chunk overheads included."""
+        calls = math.ceil(n / self.max_batch_size)
+        return calls * self.cost.overhead + n * self.cost.per_text
+
+    def estimate_wait(self, priority: Priority) -> float:
+        """Estimated seconds until work at ``priority`` queued now would start."""
+        return sum(
+            self.job_cost(job.remaining)
+            for p in Priority
+            if p <= priority
+            for job in self.queues[p]
+        )
+
+    def metrics(self) -> dict:
+        return {
+            "queues": {
+                p.name.lower(): {
+                    "jobs": len(self.queues[p]),
+                    "texts": sum(j.remaining for j in self.queues[p]),
+                    "estimated_wait_s": round(self.estimate_wait(p), 3),
+                }
+                for p in Priority
+            },
+            "completed": {p.name.lower(): n for p, n in self.completed.items()},
+            "rejected": dict(self.rejected),
+            "clients_in_flight": len(self.client_jobs),
+            "text_latency_s": round(self.cost.per_text, 5),
+            "call_overhead_s": round(self.cost.overhead, 5),
+        }
@@ -0,0 +1,232 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.scheduler_service import Priority, SchedulerRejected, ScoringScheduler, _CostModel
+
+
+class FakeSentiment:
+    """Stands in for SentimentService: sleeps per text and records call order."""
+
+    def __init__(self, per_text: float = 0.001):
+        self.per_text = per_text
+        self.calls = []
+
+    def score_texts(self, texts, symbol=None, source=None, meta=None):
+        time.sleep(self.per_text * len(texts))
+        self.calls.append(source)
+        return list(texts)
+
+
+def make_scheduler(**kwargs):
+    kwargs.setdefault("max_batch_size", 8)
+    kwargs.setdefault("initial_text_latency", 0.001)
+    return ScoringScheduler(FakeSentiment(), **kwargs)
+
+
+def texts(n):
+    return [str(i) for i in range(n)]
+
+
+def test_live_preempts_bulk_between_chunks():
+    async def run():
+        s = make_scheduler()
+        bulk = asyncio.create_task(s.submit(texts(400), Priority.BULK, client_id="a", source="bulk"))
+        await asyncio.sleep(0.02)
+        live = await s.submit(texts(4), Priority.LIVE, source="live")
+        assert not bulk.done()
+        assert len(live) == 4
+        assert len(await bulk) == 400
+        assert s.sentiment.calls.index("live") < len(s.sentiment.calls) - 1
+
+    asyncio.run(run())
+
+
+def test_round_robin_within_class():
+    async def run():
+        s = make_scheduler()
+        big = asyncio.create_task(s.submit(texts(200), Priority.BULK, client_id="a", source="big"))
+        await asyncio.sleep(0.01)
+        small = await s.submit(texts(8), Priority.BULK, client_id="b", source="small")
+        assert len(small) == 8
+        assert not big.done()
+        await big
+
+    asyncio.run(run())
+
+
+def test_oversized_request_rejected_413():
+    async def run():
+        s = make_scheduler(client_max_texts=100)
+        with pytest.raises(SchedulerRejected) as exc:
+            await s.submit(texts(101), Priority.BULK, client_id="a")
+        assert exc.value.status_code == 413
+        assert exc.value.headers() == {}
+
+    asyncio.run(run())
+
+
+def test_request_too_slow_for_deadline_rejected_413():
+    async def run():
+        s = make_scheduler(initial_text_latency=0.01)
+        with pytest.raises(SchedulerRejected) as exc:
+            await s.submit(texts(100), Priority.INTERACTIVE, client_id="a", deadline=0.5)
+        assert exc.value.status_code == 413
+        assert exc.value.headers() == {}
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("deadline", [float("nan"), float("inf"), 0.0, -1.0])
+def test_invalid_deadline_rejected(deadline):
+    async def run():
+        s = make_scheduler(initial_text_latency=10.0)
+        with pytest.raises(ValueError):
+            await s.submit(texts(100), Priority.INTERACTIVE, client_id="a", deadline=deadline)
+        assert s.client_jobs == {}
+        assert not s.queues[Priority.INTERACTIVE]
+
+    asyncio.run(run())
+
+
+def test_client_quotas_rejected_429():
+    async def run():
+        s = make_scheduler(client_max_concurrency=1, client_max_texts=500)
+        first = asyncio.create_task(s.submit(texts(300), Priority.BULK, client_id="a"))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerRejected) as exc:
+            await s.submit(texts(1), Priority.BULK, client_id="a")
+        assert exc.value.status_code == 429
+        assert "Retry-After" in exc.value.headers()
+        s.client_max_concurrency = 2
+        with pytest.raises(SchedulerRejected) as exc:
+            await s.submit(texts(300), Priority.BULK, client_id="a")
+        assert exc.value.status_code == 429
+        await first
+        assert s.client_jobs == {} and s.client_texts == {}
+
+    asyncio.run(run())
+
+
+def test_queueing_delay_shed_503():
+    async def run():
+        s = make_scheduler()
+        bulk = asyncio.create_task(s.submit(texts(400), Priority.BULK, client_id="a"))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerRejected) as exc:
+            await s.submit(texts(10), Priority.BULK, client_id="b", deadline=0.2)
+        assert exc.value.status_code == 503
+        assert "Retry-After" in exc.value.headers()
+        await bulk
+
+    asyncio.run(run())
+
+
+def test_deadline_enforced_behind_higher_priority_traffic():
+    async def run():
+        s = make_scheduler()
+        s.sentiment.per_text = 0.005
+        flood = [
+            asyncio.create_task(s.submit(texts(50), Priority.INTERACTIVE, client_id=f"c{i}"))
+            for i in range(4)
+        ]
+        await asyncio.sleep(0)
+        # bypass admission's wait estimate so the job actually queues behind the flood
+        s.estimate_wait = lambda priority: 0.0
+        started = time.monotonic()
+        with pytest.raises(SchedulerRejected) as exc:
+            await s.submit(texts(8), Priority.BULK, client_id="b", deadline=0.2)
+        assert exc.value.status_code == 503
+        assert time.monotonic() - started < 0.5
+        assert "b" not in s.client_jobs
+        assert s.queued_texts(Priority.BULK) == s.queued_texts(Priority.INTERACTIVE)
+        await asyncio.gather(*flood)
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_releases_quota():
+    async def run():
+        s = make_scheduler()
+        blocker = asyncio.create_task(s.submit(texts(200), Priority.LIVE))
+        job = asyncio.create_task(s.submit(texts(50), Priority.BULK, client_id="a"))
+        await asyncio.sleep(0.01)
+        job.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+        assert s.client_jobs == {}
+        assert not s.queues[Priority.BULK]
+        await blocker
+
+    asyncio.run(run())
+
+
+def test_worker_restarts_after_crash():
+    async def run():
+        s = make_scheduler()
+        s.start()
+        original = s._next_job
+        crashed = []
+
+        def boom():
+            if not crashed:
+                crashed.append(True)
+                raise RuntimeError("boom")
+            return original()
+
+        s._next_job = boom
+        s._wakeup.set()
+        await asyncio.sleep(0.01)
+        assert crashed
+        assert len(await s.submit(texts(3), Priority.INTERACTIVE)) == 3
+
+    asyncio.run(run())
+
+
+def test_worker_restart_backs_off():
+    async def run():
+        s = make_scheduler()
+        crashes = []
+
+        def boom():
+            crashes.append(True)
+            raise RuntimeError("boom")
+
+        s._next_job = boom
+        s.start()
+        await asyncio.sleep(0.3)
+        # 0.05s doubling backoff allows only a handful of restarts in 0.3s
+        assert 2 <= len(crashes) <= 5
+        s.start()
+        await asyncio.sleep(0)
+        assert len(crashes) <= 5
+
+    asyncio.run(run())
+
+
+def test_cost_model_separates_call_overhead():
+    model = _CostModel(per_text=0.01, overhead=0.0, size=32)
+    for _ in range(50):
+        for n in (8, 32):
+            model.observe(n, 0.5 + 0.01 * n)
+    assert model.overhead == pytest.approx(0.5, rel=0.05)
+    assert model.per_text == pytest.approx(0.01, rel=0.05)
+
+
+def test_cost_model_damps_single_stall():
+    model = _CostModel(per_text=0.01, overhead=0.0, size=32)
+    model.observe(32, 100.0)
+    assert model.predict(32) < 4 * 0.32
+
+
+def test_too_slow_uses_per_call_overhead():
+    async def run():
+        s = make_scheduler(initial_text_latency=0.001, initial_call_overhead=0.2)
+        # 40 texts = 5 chunks of 8: 5 * 0.2 + 0.04 > 1.0
+        with pytest.raises(SchedulerRejected) as exc:
+            await s.submit(texts(40), Priority.INTERACTIVE, client_id="a", deadline=1.0)
+        assert exc.value.status_code == 413
+        assert len(await s.submit(texts(8), Priority.INTERACTIVE, client_id="a", deadline=1.0)) == 8
+
+    asyncio.run(run())